@@ -8,13 +8,15 @@ PASSWORD = '412409'
 LOGIN_URL = "https://dash.infiniti.fun/earn/afk"
 
 # WebDriver Settings
-IMPLICIT_WAIT = 15  # Seconds for implicit waits
-PAGE_LOAD_TIMEOUT = 45  # Seconds for page loads
+PAGE_LOAD_TIMEOUT = 15  # Seconds for page loads
 SCRIPT_TIMEOUT = 45  # Seconds for script execution
 NETWORK_TIMEOUT = 45  # Seconds for network operations
+CHROME_PROFILE_DIR = os.environ.get('CHROME_PROFILE_DIR')  # Persistent profile; None uses a throwaway one
+BLOCK_STYLESHEETS = True  # Set False if missing CSS breaks dashboard detection
 
 # Session Settings
 SESSION_CHECK_INTERVAL = 30  # Check session every 30 seconds
+SESSION_CHECK_TTL = SESSION_CHECK_INTERVAL * 3  # Seconds a positive session check is trusted
 MAX_SESSION_TIME = 24 * 60 * 60  # Maximum session time (24 hours)
 MAX_SCREENSHOT_AGE = 24  # Maximum age for screenshots in hours
 FAILURE_THRESHOLD = 180  # Time in seconds before considering session dead
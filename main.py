@@ -1,25 +1,36 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
-
-# Setup Chrome options
-chrome_options = Options()
-chrome_options.add_argument("--headless")  # Ensure GUI doesn't open (important for Render)
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-
-# Install and setup driver
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service, options=chrome_options)
-
-# Open website
-driver.get("https://dash.infiniti.fun/earn/afk")
-print(driver.title)
-
-# Keep it open (or handle your logic)
-import time
-time.sleep(60)
-
-# Close browser
-driver.quit()
+import signal
+import threading
+
+from selenium.common.exceptions import TimeoutException
+
+import config
+from utils.webdriver import setup_driver
+
+# Set by SIGTERM so the keep-open wait below returns immediately; SIGINT keeps
+# its default KeyboardInterrupt, which the finally block below still handles
+shutdown_event = threading.Event()
+
+def signal_handler(signum, frame):
+    shutdown_event.set()
+
+signal.signal(signal.SIGTERM, signal_handler)
+
+# Setup driver with the shared headless/stealth configuration
+driver = setup_driver()
+
+try:
+    driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+
+    # Open website
+    try:
+        driver.get(config.LOGIN_URL)
+    except TimeoutException:
+        # The page is usually interactive well before slow subresources finish
+        print("Page load timed out, continuing with partially loaded page")
+    print(driver.title)
+
+    # Keep it open (or handle your logic)
+    shutdown_event.wait(60)
+finally:
+    # Close browser exactly once, on normal exit, signal or error
+    driver.quit()
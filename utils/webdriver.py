@@ -1,42 +1,100 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
+import functools
 import os
 import logging
-import subprocess
+import shutil
+import time
+
+import config
 
 logger = logging.getLogger(__name__)
 
+# Subresources the bot never reads; JS stays enabled since the dashboard is an SPA
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg',
+    '*.woff', '*.woff2', '*.ttf', '*.mp4',
+    '*/analytics*', '*/gtag*'
+]
+STYLESHEET_URL_PATTERNS = ['*.css']  # Blocked only when config.BLOCK_STYLESHEETS
+
+# Hides navigator.webdriver on every new document
+STEALTH_JS = '''
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    })
+'''
+
+DASHBOARD_SELECTOR = "div[class*='dashboard']"
+
+_session_cache = {}  # session_id -> monotonic time of last positive check
+
+_profile_lock = None  # (path, fd) of the claimed profile, held for the process lifetime
+
+# Reports 'alive'/'gone' from an in-page MutationObserver flag, installing the
+# observer on first sight of the dashboard (arguments[0]); null until it appears
+DASHBOARD_CHECK_JS = '''
+    const selector = arguments[0];
+    if (window.__dashAlive === undefined) {
+        if (!document.querySelector(selector)) return null;
+        window.__dashAlive = true;
+        new MutationObserver(() => {
+            window.__dashAlive = !!document.querySelector(selector);
+        }).observe(document.body, {
+            childList: true, subtree: true, attributes: true, attributeFilter: ['class']
+        });
+    }
+    return window.__dashAlive ? 'alive' : 'gone';
+'''
+
+@functools.lru_cache(maxsize=1)
 def find_chrome_binary():
-    """Find Chrome binary in the Nix store"""
+    """Find Chrome binary in the Nix store (cached for the process lifetime)"""
     try:
-        # Check common Nix store locations
-        nix_paths = [
-            '/nix/store/*/bin/chromium',
-            '/usr/bin/chromium',
-            '/usr/bin/chromium-browser'
-        ]
-        
-        for path_pattern in nix_paths:
-            import glob
-            matches = glob.glob(path_pattern)
-            if matches:
-                return matches[0]
-                
-        # Fallback to which
-        result = subprocess.run(['which', 'chromium'], capture_output=True, text=True)
-        if result.returncode == 0:
-            return result.stdout.strip()
-            
-        return None
+        # Check the Nix store, stopping at the first match instead of globbing it all
+        if os.path.isdir('/nix/store'):
+            with os.scandir('/nix/store') as entries:
+                for entry in entries:
+                    candidate = os.path.join(entry.path, 'bin', 'chromium')
+                    if os.path.exists(candidate):
+                        return candidate
+
+        # Check common system locations
+        for path in ('/usr/bin/chromium', '/usr/bin/chromium-browser'):
+            if os.path.exists(path):
+                return path
+
+        # Fallback to searching PATH
+        return shutil.which('chromium')
     except Exception as e:
-        logger.error(f"Error finding Chrome binary: {str(e)}")
+        logger.error("Error finding Chrome binary: %s", e)
         return None
 
+def lock_profile_dir(profile_dir):
+    """Claim a persistent Chrome profile so only one process uses it at a time"""
+    global _profile_lock
+    if _profile_lock is not None:
+        return _profile_lock[0] == profile_dir
+    try:
+        import fcntl  # POSIX-only; imported here since the feature is opt-in
+
+        os.makedirs(profile_dir, exist_ok=True)
+        lock_fd = os.open(os.path.join(profile_dir, '.bot.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(lock_fd)
+            raise
+        _profile_lock = (profile_dir, lock_fd)
+        return True
+    except (ImportError, OSError) as e:
+        logger.warning("Could not lock Chrome profile %s, using a temporary profile: %s", profile_dir, e)
+        return False
+
 def setup_driver():
     """Configure and return ChromeDriver with optimal settings"""
     logger.info("Setting up Chrome WebDriver...")
@@ -49,17 +107,49 @@ def setup_driver():
     chrome_options.add_argument('--disable-popup-blocking')
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    # Trim background work and helper processes on small headless hosts
+    chrome_options.add_argument('--disable-renderer-backgrounding')
+    chrome_options.add_argument('--disable-background-timer-throttling')
+    chrome_options.add_argument('--disable-backgrounding-occluded-windows')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-low-res-tiling')
+    chrome_options.add_argument('--disable-client-side-phishing-detection')
+    chrome_options.add_argument('--disable-crash-reporter')
+    chrome_options.add_argument('--no-crash-upload')
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_argument('--disable-component-update')
+    chrome_options.add_argument('--disable-default-apps')
+    chrome_options.add_argument('--disable-sync')
+    chrome_options.add_argument('--disable-translate')
+    chrome_options.add_argument('--metrics-recording-only')
+    chrome_options.add_argument('--mute-audio')
+    chrome_options.add_argument('--no-first-run')
+    chrome_options.add_argument('--safebrowsing-disable-auto-update')
+    chrome_options.add_argument('--disable-features=TranslateUI,IsolateOrigins,SitePerProcess')
+    chrome_options.add_argument('--renderer-process-limit=1')  # Only one tab is used
     chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.default_content_setting_values.notifications': 2
+    })
+
+    # Return from driver.get() at DOMContentLoaded instead of polling for 'complete'
+    chrome_options.page_load_strategy = 'eager'
 
     # Try to find Chrome binary
     chrome_binary = find_chrome_binary()
     if chrome_binary:
-        logger.info(f"Found Chrome binary at: {chrome_binary}")
+        logger.info("Found Chrome binary at: %s", chrome_binary)
         chrome_options.binary_location = chrome_binary
     else:
         logger.warning("Could not find Chrome binary, using default location")
 
+    # Reuse a persistent profile so HTTP and V8 code caches survive restarts
+    if config.CHROME_PROFILE_DIR and lock_profile_dir(config.CHROME_PROFILE_DIR):
+        chrome_options.add_argument(f'--user-data-dir={config.CHROME_PROFILE_DIR}')
+
     # Reduce logging noise
     chrome_options.add_argument('--log-level=3')
 
@@ -68,44 +158,64 @@ def setup_driver():
         logger.info("Initializing Chrome WebDriver...")
         driver = webdriver.Chrome(options=chrome_options)
 
+        # Rely on explicit WebDriverWait only; implicit waits compound with them
+        driver.implicitly_wait(0)
+
         # Set window size explicitly
         driver.set_window_size(1920, 1080)
 
+        # Skip images, fonts, media and analytics (and stylesheets when configured)
+        # to cut page-load bandwidth and CPU
+        blocked_urls = BLOCKED_URL_PATTERNS
+        if config.BLOCK_STYLESHEETS:
+            blocked_urls = blocked_urls + STYLESHEET_URL_PATTERNS
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_urls})
+
         # Execute stealth script to avoid detection
         driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-            'source': '''
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                })
-            '''
+            'source': STEALTH_JS
         })
 
         logger.info("Chrome WebDriver initialized successfully")
         return driver
     except WebDriverException as e:
-        logger.error(f"WebDriver initialization error: {str(e)}")
+        logger.error("WebDriver initialization error: %s", e)
         raise Exception(f"Failed to initialize WebDriver: {str(e)}")
 
 def is_session_active(driver):
     """Check if the current session is still active without refreshing"""
-    try:
-        # Check if we can interact with the page
-        driver.execute_script("return document.readyState")
+    last_ok = _session_cache.get(driver.session_id)
+    if last_ok is not None and time.monotonic() - last_ok < config.SESSION_CHECK_TTL:
+        return True
 
-        # Additional check for specific element that should be present
-        WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'dashboard')]"))
+    try:
+        # One script per poll answers the whole question; on a page already being
+        # observed it returns on the first call
+        state = WebDriverWait(driver, 5).until(
+            lambda d: d.execute_script(DASHBOARD_CHECK_JS, DASHBOARD_SELECTOR)
         )
+    except Exception:
+        # A dead chromedriver/Chrome surfaces as a urllib3 or socket error rather
+        # than a WebDriverException; KeyboardInterrupt still propagates
+        state = None
+
+    if state == 'alive':
+        _session_cache[driver.session_id] = time.monotonic()
         return True
-    except:
-        return False
+    _session_cache.pop(driver.session_id, None)
+    return False
+
+def forget_session(driver):
+    """Drop any cached liveness for this driver; call before driver.quit()"""
+    _session_cache.pop(driver.session_id, None)
 
-def wait_for_element(driver, by, value, timeout=10):
-    """Wait for element to be present and visible"""
+def wait_for_element(driver, by, value, timeout=10, poll_frequency=0.2):
+    """Wait for element to be present in the DOM"""
     try:
-        element = WebDriverWait(driver, timeout).until(
+        element = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
             EC.presence_of_element_located((by, value))
         )
         return element
     except TimeoutException:
-        raise Exception(f"Element not found: {value}")
\ No newline at end of file
+        raise Exception(f"Element not found: {value}")